@@ -1,22 +1,40 @@
 import yaml
+import asyncio
+import functools
+import orjson
+from pathlib import Path
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import logging as L
 import os
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import APIRouter, FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from triggers.unity_table_listener_function import unity_table_listener
-from triggers.execute import execute_action
+from triggers.unity_table_listener_function import cancel_pending_actions, unity_table_listener
+from triggers.execute import available_functions, execute_action, preload_functions
+from common.pool import close_pools
 from common.websocket_manager import manager
 
+# Use PyYAML's C parser when libyaml is available
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as YAMLLoader
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     FastAPI lifespan context manager that handles application startup and shutdown.
     
-    This function sets up all triggers (HTTP, timer, and Unity table) during application startup.
+    This function sets up all triggers (HTTP, timer, and Unity table) during application startup
+    and only then starts the scheduler and the Unity table sweeper, so nothing runs before
+    registration is complete. On shutdown the sweeper and the scheduler are stopped, functions
+    still running after a table change are cancelled, pooled warehouse connections are closed
+    and open WebSocket connections are closed.
     It uses the asynccontextmanager to properly handle async setup and teardown.
     
     Args:
@@ -25,17 +43,44 @@ async def lifespan(app: FastAPI):
     Yields:
         None: Control is yielded back to FastAPI after setup is complete
     """
+    from triggers.handlers import start_unity_sweeper, stop_unity_sweeper
+    
     await setup_triggers()
+    scheduler.start()
+    start_unity_sweeper()
     yield
+    await stop_unity_sweeper()
+    scheduler.shutdown(wait=False)
+    await cancel_pending_actions()
+    await asyncio.to_thread(close_pools)
+    await manager.close_all()
 
 app = FastAPI(lifespan=lifespan)
 
 
 # Load function definitions from YAML file
+@functools.lru_cache(maxsize=8)
+def _parse_function_definitions(file_path: str, mtime_ns: int) -> dict:
+    """
+    Parse a YAML configuration file, memoised on its modification time.
+    
+    Args:
+        file_path (str): Path to the YAML configuration file
+        mtime_ns (int): Modification time of the file, used as part of the cache key
+        
+    Returns:
+        dict: Parsed YAML content
+    """
+    with open(file_path, 'r') as file:
+        return yaml.load(file, Loader=YAMLLoader)
+
 def load_function_definitions(file_path: str) -> dict:
     """
     Load and parse function definitions from a YAML configuration file.
     
+    The parsed content is cached and only re-read when the file's
+    modification time changes.
+    
     Args:
         file_path (str): Path to the YAML configuration file containing function definitions
         
@@ -46,8 +91,7 @@ def load_function_definitions(file_path: str) -> dict:
         yaml.YAMLError: If the YAML file is malformed
         FileNotFoundError: If the specified file does not exist
     """
-    with open(file_path, 'r') as file:
-        return yaml.safe_load(file)
+    return _parse_function_definitions(file_path, os.stat(file_path).st_mtime_ns)
 
 # Example usage
 function_definitions = load_function_definitions('app.yaml')
@@ -55,7 +99,17 @@ function_definitions = load_function_definitions('app.yaml')
 # Initialize scheduler
 scheduler = AsyncIOScheduler()
 
+# Function listing entries keyed by function name: (source mtime_ns, YAML config, entry with code)
+_FUNCTIONS_RESPONSE_CACHE: dict[str, tuple[int, dict, dict]] = {}
+# Serialized /api/v1/functions body, rebuilt whenever a cached entry or the YAML changes
+_FUNCTIONS_RESPONSE_BODY: Optional[bytes] = None
+# Parsed function list the cached body was built from
+_FUNCTIONS_RESPONSE_DEFINITIONS: Optional[list] = None
+
         
+# Function implementations in the functions directory, as scanned by triggers.execute
+_AVAILABLE_FUNCTIONS = available_functions('functions')
+
 def check_function_exists(function: str) -> bool:
     """
     Check if a function implementation file exists in the functions directory.
@@ -67,10 +121,10 @@ def check_function_exists(function: str) -> bool:
         bool: True if the function implementation file exists, False otherwise
         
     Note:
-        This function checks for files in the format 'functions/{function}_function.py'
+        This function checks for files in the format 'functions/{function}_function.py',
+        using the directory listing triggers.execute takes when the application starts
     """
-    file = f"functions/{function}_function.py"
-    return os.path.exists(file)
+    return function in _AVAILABLE_FUNCTIONS
 
 # Set up triggers
 async def setup_triggers() -> None:
@@ -80,6 +134,10 @@ async def setup_triggers() -> None:
     This async function processes each function definition and sets up the appropriate trigger
     using the TriggerHandlerFactory to create and configure the correct handler type.
     
+    Handlers are created in order and then set up concurrently. HTTP endpoints are
+    collected on a single APIRouter that is included into the app once, after every
+    handler has been set up.
+    
     The function broadcasts progress messages via WebSocket during setup.
     
     Raises:
@@ -90,6 +148,16 @@ async def setup_triggers() -> None:
     
     await manager.broadcast_log("Starting trigger setup...")
     
+    # Import function modules up front so the first trigger fire skips the import
+    await preload_functions([
+        function_instance['name'] for function_instance in function_definitions['functions']
+        if check_function_exists(function_instance['name'])
+    ])
+    
+    # HTTP triggers register their endpoints here; included into the app once at the end
+    router = APIRouter()
+    
+    handlers = []
     for function_instance in function_definitions['functions']:
         function_name = function_instance['name']
         
@@ -102,24 +170,27 @@ async def setup_triggers() -> None:
             
         try:
             # Create appropriate handler
-            handler = TriggerHandlerFactory.create_handler(
+            handlers.append(TriggerHandlerFactory.create_handler(
                 function_name=function_name,
                 trigger_config=function_instance['trigger'],
                 app=app,
-                scheduler=scheduler
-            )
-            
-            # Set up the trigger
-            await handler.setup()
-            
+                scheduler=scheduler,
+                router=router
+            ))
         except Exception as e:
             error_msg = f"Error setting up trigger for {function_name}: {str(e)}"
             L.error(error_msg)
             await manager.broadcast_log(error_msg)
-
-# Start the scheduler
-scheduler.start()
-
+    
+    # Set up all triggers concurrently; one failing setup doesn't stop the others
+    results = await asyncio.gather(*[handler.setup() for handler in handlers], return_exceptions=True)
+    for handler, result in zip(handlers, results):
+        if isinstance(result, Exception):
+            error_msg = f"Error setting up trigger for {handler.function_name}: {str(result)}"
+            L.error(error_msg)
+            await manager.broadcast_log(error_msg)
+    
+    app.include_router(router)
 
 @app.get("/api/v1/health")
 async def health_check() -> dict:
@@ -133,8 +204,8 @@ async def health_check() -> dict:
     return {"status": "healthy"}
 
 # endpoint to list the functions
-@app.get("/api/v1/functions")
-async def list_functions() -> dict:
+@app.get("/api/v1/functions", response_class=ORJSONResponse)
+async def list_functions() -> Response:
     """
     Endpoint to list all configured functions and their source code.
     
@@ -143,18 +214,42 @@ async def list_functions() -> dict:
     and monitoring purposes.
     
     Returns:
-        dict: A dictionary containing a list of functions with their configurations
-              and source code {"functions": [...]}
+        Response: JSON body containing a list of functions with their configurations
+                  and source code {"functions": [...]}
               
     Note:
         Each function object includes:
         - Original configuration from YAML
         - Source code from the implementation file
+        
+        The YAML configuration is re-read through load_function_definitions,
+        so edits to app.yaml show up here once its modification time changes.
+        Entries are cached in memory and a source file is only re-read
+        when its modification time or YAML configuration changes. The
+        orjson-encoded body is cached too, so unchanged listings are not
+        re-serialized.
     """
-    functions = function_definitions['functions']
-    for function in functions:
-        function['code'] = open(f"functions/{function['name']}_function.py", "r").read()
-    return {"functions": functions}
+    global _FUNCTIONS_RESPONSE_BODY, _FUNCTIONS_RESPONSE_DEFINITIONS
+    definitions = load_function_definitions('app.yaml')['functions']
+    stale = []
+    for function in definitions:
+        path = Path(f"functions/{function['name']}_function.py")
+        mtime_ns = path.stat().st_mtime_ns
+        cached = _FUNCTIONS_RESPONSE_CACHE.get(function['name'])
+        if cached is None or cached[0] != mtime_ns or cached[1] != function:
+            stale.append((function, path, mtime_ns))
+    
+    # Read changed source files in the thread pool so the event loop stays free
+    if stale:
+        sources = await asyncio.gather(*[asyncio.to_thread(path.read_text) for _, path, _ in stale])
+        for (function, _, mtime_ns), code in zip(stale, sources):
+            _FUNCTIONS_RESPONSE_CACHE[function['name']] = (mtime_ns, function, {**function, 'code': code})
+    
+    if stale or definitions is not _FUNCTIONS_RESPONSE_DEFINITIONS:
+        functions = [_FUNCTIONS_RESPONSE_CACHE[function['name']][2] for function in definitions]
+        _FUNCTIONS_RESPONSE_BODY = orjson.dumps({"functions": functions})
+        _FUNCTIONS_RESPONSE_DEFINITIONS = definitions
+    return Response(content=_FUNCTIONS_RESPONSE_BODY, media_type="application/json")
 
 @app.websocket("/api/v1/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
@@ -183,8 +278,8 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     try:
         while True:
             data = await websocket.receive_text()
-            # Echo the message back to the sender
-            await websocket.send_text(f"Message received: {data}")
+            # Echo the message back to the sender via its writer task
+            manager.send_nowait(websocket, f"Message received: {data}")
     except WebSocketDisconnect:
         L.info("Client disconnected")
         manager.disconnect(websocket)
@@ -194,6 +289,9 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         
 
 
+# Compress larger HTTP responses such as the function listing
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 if os.environ.get("ENV") == "DEV":
     print("Local mode")
     origins = [
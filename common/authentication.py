@@ -5,6 +5,28 @@ from databricks.sql.client import Connection
 from databricks.sdk.core import Config, oauth_service_principal
 import logging
 
+def _compute_local_tz() -> str:
+    """
+    Get the local timezone offset in +/-HH:MM format.
+    
+    This function determines the local system timezone and formats its
+    UTC offset in a format suitable for Databricks SQL connections.
+    
+    Returns:
+        str: Timezone offset in format '+HH:MM' or '-HH:MM'
+        
+    Example:
+        For UTC+1 returns '+01:00'
+        For UTC-7 returns '-07:00'
+    """
+    now = datetime.now().astimezone()
+    # Get the UTC offset in hours and minutes
+    utc_offset = now.strftime('%z')
+    # Format the UTC offset as +HH:MM or -HH:MM
+    formatted_offset = f"{utc_offset[:3]}:{utc_offset[3:]}"
+    return formatted_offset
+
+
 class DatabricksAuthentication:
     """
     Handles authentication to Databricks services using various authentication methods.
@@ -70,17 +92,18 @@ class DatabricksAuthentication:
             
         Note:
             The connection is configured with the local timezone for consistent
-            timestamp handling across different environments.
+            timestamp handling across different environments. The UTC offset is
+            computed for each new connection, as it changes at DST transitions.
         """
+        local_tz = _compute_local_tz()
         if self.bearer:
             logging.log(logging.INFO, "Using bearer authentication")
             return sql.connect(
                 server_hostname=self.server,
                 http_path=self.path,
                 access_token=self.bearer,
-                session_configuration= {"timezone": self._local_tz()},
+                session_configuration= {"timezone": local_tz},
             )
-        local_tz = self._local_tz()
         if "DATABRICKS_TOKEN" in os.environ:
             logging.log(logging.INFO, "Using token authentication")
             return sql.connect(
@@ -123,24 +146,3 @@ class DatabricksAuthentication:
             client_secret=os.getenv("DATABRICKS_CLIENT_SECRET"),
         )
         return oauth_service_principal(config)
-
-    def _local_tz(self) -> str:
-        """
-        Get the local timezone offset in +/-HH:MM format.
-        
-        This method determines the local system timezone and formats its
-        UTC offset in a format suitable for Databricks SQL connections.
-        
-        Returns:
-            str: Timezone offset in format '+HH:MM' or '-HH:MM'
-            
-        Example:
-            For UTC+1 returns '+01:00'
-            For UTC-7 returns '-07:00'
-        """
-        now = datetime.now().astimezone()
-        # Get the UTC offset in hours and minutes
-        utc_offset = now.strftime('%z')
-        # Format the UTC offset as +HH:MM or -HH:MM
-        formatted_offset = f"{utc_offset[:3]}:{utc_offset[3:]}"
-        return formatted_offset
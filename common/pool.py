@@ -0,0 +1,257 @@
+"""
+Connection pooling for Databricks SQL warehouse connections.
+
+Opening a Databricks SQL connection costs a TCP/TLS handshake plus session
+setup on the warehouse, so connections are kept in process-wide pools and
+borrowed per statement. One pool exists per authentication fingerprint
+(workspace host, warehouse path and credential), so callers using different
+credentials never share connections.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging as L
+import os
+import queue
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+from databricks.sql.client import Connection
+from common.authentication import DatabricksAuthentication
+
+# Default pool bounds
+DEFAULT_MIN_SIZE = 1
+DEFAULT_MAX_SIZE = 10
+
+# Idle connections are re-validated on checkout once they have been unused this long (seconds)
+DEFAULT_VALIDATE_AFTER = 60.0
+
+# Pools keyed by authentication fingerprint
+_pools: Dict[str, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    """
+    A bounded, thread-safe pool of Databricks SQL connections.
+
+    Connections are borrowed with the async `acquire()` context manager from
+    coroutines, or with the blocking `connection()` context manager from
+    worker threads (e.g. synchronous functions run via asyncio.to_thread).
+    Connections that have sat idle longer than `validate_after` seconds are
+    validated with a lightweight query on checkout and evicted if they are
+    no longer usable. Recently used connections are handed out as-is, so a
+    busy pool adds no extra warehouse round trips. A connection whose borrower
+    raised is always validated before it is handed out again, so a dead
+    session is evicted on the next checkout.
+
+    Attributes:
+        min_size (int): Number of connections opened when the pool is warmed
+        max_size (int): Maximum number of connections checked out at once
+        validate_after (float): Idle time in seconds after which a connection is validated
+    """
+
+    def __init__(self, connect: Callable[[], Connection],
+                 min_size: int = DEFAULT_MIN_SIZE, max_size: int = DEFAULT_MAX_SIZE,
+                 validate_after: float = DEFAULT_VALIDATE_AFTER) -> None:
+        """
+        Initialize an empty connection pool.
+
+        Args:
+            connect (Callable[[], Connection]): Factory opening a new connection
+            min_size (int): Number of connections opened by `open()`
+            max_size (int): Maximum number of connections checked out at once
+            validate_after (float): Idle time in seconds after which a connection is validated
+        """
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.validate_after = validate_after
+        # Idle connections with the monotonic time they were last returned
+        self._idle: "queue.LifoQueue[Tuple[Connection, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Coroutines wait for a slot here, on the event loop, rather than in a worker thread
+        self._async_slots = asyncio.Semaphore(max_size)
+
+    async def open(self) -> None:
+        """
+        Warm the pool by opening connections up to `min_size`.
+
+        Connections are opened concurrently in the thread pool so the
+        event loop is not blocked by the handshakes.
+        """
+        missing = self.min_size - self._idle.qsize()
+        if missing > 0:
+            connections = await asyncio.gather(*[asyncio.to_thread(self._connect) for _ in range(missing)])
+            now = time.monotonic()
+            for connection in connections:
+                self._idle.put((connection, now))
+
+    def close(self) -> None:
+        """Close all idle connections held by the pool."""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Connection]:
+        """
+        Borrow a connection from the pool for the duration of the context.
+
+        While `max_size` coroutines hold connections, further callers wait on
+        the event loop, so waiting never occupies a thread of the default
+        executor. Only the checkout itself runs in a worker thread.
+
+        Yields:
+            Connection: A validated Databricks SQL connection
+        """
+        async with self._async_slots:
+            connection = await asyncio.to_thread(self._checkout)
+            try:
+                yield connection
+            except BaseException:
+                self._checkin(connection, suspect=True)
+                raise
+            self._checkin(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        Blocking variant of `acquire()` for use outside the event loop.
+
+        Yields:
+            Connection: A validated Databricks SQL connection
+        """
+        connection = self._checkout()
+        try:
+            yield connection
+        except BaseException:
+            self._checkin(connection, suspect=True)
+            raise
+        self._checkin(connection)
+
+    def _checkout(self) -> Connection:
+        """
+        Take an idle connection, or open a new one if none is usable.
+
+        Blocks while `max_size` connections are already checked out. Only
+        connections idle for longer than `validate_after` are validated.
+
+        Returns:
+            Connection: A validated Databricks SQL connection
+        """
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    connection, returned_at = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if time.monotonic() - returned_at < self.validate_after or self._validate(connection):
+                    return connection
+                self._discard(connection)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, connection: Connection, suspect: bool = False) -> None:
+        """
+        Return a borrowed connection to the pool.
+
+        Args:
+            connection (Connection): The connection being returned
+            suspect (bool): True if the borrower raised; the connection is then
+                            validated on its next checkout however recently it was used
+        """
+        returned_at = float("-inf") if suspect else time.monotonic()
+        self._idle.put((connection, returned_at))
+        self._slots.release()
+
+    @staticmethod
+    def _validate(connection: Connection) -> bool:
+        """Check that a connection is still usable by running a trivial query."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            return True
+        except Exception as e:
+            L.warning(f"Evicting unusable Databricks connection: {str(e)}")
+            return False
+
+    @staticmethod
+    def _discard(connection: Connection) -> None:
+        """Close a connection, ignoring errors from already broken sessions."""
+        try:
+            connection.close()
+        except Exception as e:
+            L.warning(f"Error closing Databricks connection: {str(e)}")
+
+
+def _fingerprint(bearer: Optional[str]) -> str:
+    """
+    Build a key identifying the workspace, warehouse and credential in use.
+
+    The credential is hashed so secrets are never held as dictionary keys.
+
+    Args:
+        bearer (str, optional): Bearer token passed to DatabricksAuthentication
+
+    Returns:
+        str: SHA-256 hex digest of the authentication settings
+    """
+    credential = bearer or os.getenv("DATABRICKS_TOKEN") or os.getenv("DATABRICKS_CLIENT_ID") or ""
+    parts = [os.getenv("DATABRICKS_HOST") or "", os.getenv("DATABRICKS_WAREHOUSE_PATH") or "", credential]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def get_pool(bearer: Optional[str] = None) -> ConnectionPool:
+    """
+    Return the process-wide pool for the current authentication settings.
+
+    Args:
+        bearer (str, optional): Bearer token for direct authentication.
+                              If not provided, environment credentials are used.
+
+    Returns:
+        ConnectionPool: The shared pool for this fingerprint, created on first use
+    """
+    key = _fingerprint(bearer)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(lambda: DatabricksAuthentication(bearer).client)
+            _pools[key] = pool
+        return pool
+
+
+def close_pools() -> None:
+    """
+    Close the idle connections of every pool.
+
+    Called on application shutdown so warehouse sessions are not left open.
+    This blocks, so run it in a worker thread from the event loop.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+@functools.cache
+def get_default_pool() -> ConnectionPool:
+    """
+    Return the shared pool for the environment credentials.
+
+    The fingerprint is resolved once per process, so repeated callers skip
+    re-reading the environment and hashing the credential.
+
+    Returns:
+        ConnectionPool: The pool used by default for Unity instances
+    """
+    return get_pool()
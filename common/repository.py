@@ -1,9 +1,14 @@
-from common.authentication import DatabricksAuthentication
-from pandas import DataFrame
+from common.pool import ConnectionPool, get_default_pool
+import pyarrow as pa
 import asyncio
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
 import logging as L
 
+# Threads reserved for waiting on and fetching SQL results, kept apart from the
+# default executor used by sync functions and FastAPI
+_SQL_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="sql")
+
 class Unity:
     """
     A class to interact with Unity tables through Databricks SQL.
@@ -13,55 +18,96 @@ class Unity:
     - Monitor Unity table versions and changes
     - Handle table history and versioning
     
-    The class uses DatabricksAuthentication for secure access to Unity tables.
+    Statements borrow connections from a shared ConnectionPool, so creating
+    a Unity instance does not open a new warehouse connection.
     
     Attributes:
-        client: Authenticated Databricks SQL client instance
+        pool (ConnectionPool): Pool of authenticated Databricks SQL connections
     """
-    def __init__(self) -> None:
-        """Initialize Unity class with an authenticated Databricks client."""
-        self.client = DatabricksAuthentication().client
+    def __init__(self, pool: Optional[ConnectionPool] = None) -> None:
+        """
+        Initialize Unity class with a Databricks connection pool.
+        
+        Args:
+            pool (ConnectionPool, optional): Pool to borrow connections from.
+                                           Defaults to the shared pool for the environment credentials.
+        """
+        self.pool = pool or get_default_pool()
 
-    async def run_sql_statement_async(self, statement: str) -> Optional[DataFrame]:
+    @classmethod
+    async def create(cls, pool: Optional[ConnectionPool] = None) -> "Unity":
         """
-        Execute a SQL statement asynchronously and return results as a DataFrame.
+        Create a Unity instance with a warmed connection pool.
+        
+        Args:
+            pool (ConnectionPool, optional): Pool to borrow connections from
+            
+        Returns:
+            Unity: Instance whose pool has at least min_size open connections
+        """
+        unity = cls(pool)
+        await unity.pool.open()
+        return unity
+
+    async def run_sql_statement_async(self, statement: str) -> Optional[pa.Table]:
+        """
+        Execute a SQL statement asynchronously and return results as an Arrow table.
         
         This method:
         1. Executes the SQL statement asynchronously using Databricks cursor
-        2. Converts the result to an Arrow table
-        3. Returns the data as a pandas DataFrame
+        2. Returns the result as an Arrow table
         
         Args:
             statement (str): The SQL statement to execute
             
         Returns:
-            Optional[DataFrame]: Results as a pandas DataFrame, or None if no results
+            Optional[pa.Table]: Results as an Arrow table, or None if no results
             
         Raises:
             Exception: If there's an error executing the SQL statement
             
         Note:
-            This method is non-blocking and suitable for long-running queries
+            This method is non-blocking and suitable for long-running queries.
+            Callers needing pandas should convert once with
+            `table.to_pandas(self_destruct=True)` to release Arrow buffers as they go.
         """
-        with self.client.cursor() as cursor:
-            call = cursor.execute_async(statement)
-            result = await asyncio.to_thread(lambda: call.get_async_execution_result())
-            return await asyncio.to_thread(lambda: call.fetchall_arrow().to_pandas())
+        return await self._execute_async(statement, lambda call: call.fetchall_arrow())
+
+    async def _execute_async(self, statement: str, fetch: Callable[[Any], Any]) -> Any:
+        """
+        Execute a SQL statement asynchronously and fetch its result in the SQL thread pool.
+        
+        Args:
+            statement (str): The SQL statement to execute
+            fetch (Callable): Called with the executed cursor to materialise the result
+            
+        Returns:
+            Any: Whatever `fetch` returns
+        """
+        async with self.pool.acquire() as connection:
+            with connection.cursor() as cursor:
+                call = cursor.execute_async(statement)
+                
+                # Wait for and fetch the result in a single thread hop
+                def _run() -> Any:
+                    call.get_async_execution_result()
+                    return fetch(call)
+                
+                return await asyncio.get_running_loop().run_in_executor(_SQL_EXECUTOR, _run)
             
-    def run_sql_statement(self, statement: str) -> Optional[DataFrame]:
+    def run_sql_statement(self, statement: str) -> Optional[pa.Table]:
         """
-        Execute a SQL statement synchronously and return results as a DataFrame.
+        Execute a SQL statement synchronously and return results as an Arrow table.
         
         This method:
         1. Executes the SQL statement using Databricks cursor
-        2. Converts the result to an Arrow table
-        3. Returns the data as a pandas DataFrame
+        2. Returns the result as an Arrow table
         
         Args:
             statement (str): The SQL statement to execute
             
         Returns:
-            Optional[DataFrame]: Results as a pandas DataFrame, or None if no results
+            Optional[pa.Table]: Results as an Arrow table, or None if no results
             
         Raises:
             Exception: If there's an error executing the SQL statement
@@ -70,23 +116,27 @@ class Unity:
             This method is blocking and will wait for the query to complete
             For long-running queries, prefer run_sql_statement_async
         """
-        with self.client.cursor() as cursor:
-            cursor.execute(statement)
-            return cursor.fetchall_arrow().to_pandas()
+        with self.pool.connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(statement)
+                return cursor.fetchall_arrow()
 
     async def get_latest_version(self, table_name: str) -> int:
         """
         Get the latest version number for a Unity table using DESCRIBE HISTORY.
         Returns the most recent version number.
+        
+        The single history row is read straight from the cursor rather than
+        being materialised as a table.
         """
         try:
             history_query = f"DESCRIBE HISTORY {table_name} LIMIT 1"
-            history = await self.run_sql_statement_async(history_query)
+            row = await self._execute_async(history_query, lambda call: call.fetchone())
             
-            if history.empty:
+            if row is None:
                 raise ValueError(f"No history found for table {table_name}")
             
-            return history["version"].iloc[0]
+            return row.version
         except Exception as e:
             raise Exception(f"Error getting table history: {str(e)}")
 
@@ -121,28 +171,44 @@ class Unity:
             
         Note:
             The first run (last_processed_version=None) always returns initial state
-            without triggering change detection
+            without triggering change detection.
+            The only query is a single-row DESCRIBE HISTORY probe; when the version
+            matches last_processed_version, None is returned without building a result.
         """
         try:
-            L.info(f"Detecting changes for table {table_name} with last processed version {last_processed_version}")
+            L.info("Detecting changes for table %s with last processed version %s", table_name, last_processed_version)
             latest_version = await self.get_latest_version(table_name)
             
-            # If no last version provided, return initial state
-            if last_processed_version is None:
-                return {
-                    "type": "initial_state",
-                    "latest_version": latest_version,
-                }
-            
-            # Check if there are any changes
+            # Fast path: nothing has changed since the last processed version
             if latest_version == last_processed_version:
                 return None
             
             return {
-                "type": "changes_detected",
+                # No last version means this is the first run for the table
+                "type": "initial_state" if last_processed_version is None else "changes_detected",
                 "latest_version": latest_version,
             }
             
         except Exception as e:
             raise Exception(f"Error detecting changes: {str(e)}")
 
+# Shared Unity instance, created and warmed on first use
+_shared_unity: Optional[Unity] = None
+_shared_unity_lock = asyncio.Lock()
+
+async def get_unity() -> Unity:
+    """
+    Return the process-wide Unity instance, creating it on first use.
+    
+    Concurrent first callers wait on a lock so the instance (and the warm-up
+    of its connection pool) is only created once.
+    
+    Returns:
+        Unity: The shared Unity instance
+    """
+    global _shared_unity
+    if _shared_unity is None:
+        async with _shared_unity_lock:
+            if _shared_unity is None:
+                _shared_unity = await Unity.create()
+    return _shared_unity
@@ -1,7 +1,44 @@
+import asyncio
 import logging as L
-from typing import List
+from collections import deque
+from typing import Deque, Dict, List, Set
 from fastapi import WebSocket, WebSocketDisconnect
 
+# Maximum number of messages queued for a single client; the oldest is dropped when full
+CLIENT_QUEUE_SIZE = 256
+
+class _Outbox:
+    """
+    Bounded queue of ASGI send events for one client.
+    
+    Appending never blocks: when the queue is full the oldest event is
+    dropped, so a slow client can only lose its own backlog.
+    """
+    def __init__(self, maxlen: int = CLIENT_QUEUE_SIZE) -> None:
+        self.events: Deque[dict] = deque(maxlen=maxlen)
+        self.ready = asyncio.Event()
+
+    def put(self, event: dict) -> None:
+        """Append an event, dropping the oldest one if the queue is full."""
+        if len(self.events) == self.events.maxlen:
+            L.warning("Dropping oldest message for slow websocket client")
+        self.events.append(event)
+        self.ready.set()
+
+    def put_many(self, events: List[dict]) -> None:
+        """Append several events in order, dropping the oldest ones if the queue overflows."""
+        if len(self.events) + len(events) > self.events.maxlen:
+            L.warning("Dropping oldest messages for slow websocket client")
+        self.events.extend(events)
+        self.ready.set()
+
+    async def get(self) -> dict:
+        """Wait for and remove the oldest queued event."""
+        while not self.events:
+            self.ready.clear()
+            await self.ready.wait()
+        return self.events.popleft()
+
 class ConnectionManager:
     """
     Manages WebSocket connections and handles broadcasting messages to connected clients.
@@ -10,19 +47,29 @@ class ConnectionManager:
     - Track active WebSocket connections
     - Handle client connections and disconnections
     - Broadcast messages to all connected clients
+    - Queue messages to each client through its own writer task
     - Handle connection errors gracefully
     
+    Every client has a bounded queue drained by a dedicated writer task, so
+    sending to clients never waits on the network and a slow client only
+    loses its own oldest messages.
+    
     Attributes:
-        active_connections (List[WebSocket]): List of currently active WebSocket connections
+        active_connections (Set[WebSocket]): Set of currently active WebSocket connections
     """
     def __init__(self):
-        """Initialize the connection manager with an empty list of connections."""
-        self.active_connections: List[WebSocket] = []
+        """Initialize the connection manager with an empty set of connections."""
+        self.active_connections: Set[WebSocket] = set()
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
         """
         Accept a new WebSocket connection and add it to active connections.
         
+        A writer task is started for the connection to drain its message
+        queue, so sending never blocks the caller.
+        
         Args:
             websocket (WebSocket): The WebSocket connection to accept
             
@@ -30,7 +77,10 @@ class ConnectionManager:
             WebSocketException: If the connection cannot be accepted
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        outbox = _Outbox()
+        self._outboxes[websocket] = outbox
+        self._writers[websocket] = asyncio.create_task(self._write(websocket, outbox))
 
     def disconnect(self, websocket: WebSocket) -> None:
         """
@@ -40,32 +90,128 @@ class ConnectionManager:
             websocket (WebSocket): The WebSocket connection to remove
             
         Note:
-            This method is called both for normal disconnections and error cases
+            This method is called both for normal disconnections and error cases,
+            and is a no-op if the connection has already been removed
         """
-        self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self._stop_writer(websocket)
+
+    def _stop_writer(self, websocket: WebSocket) -> None:
+        """Drop a connection's queue and cancel its writer task, if any."""
+        self._outboxes.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def close_all(self) -> None:
+        """
+        Close every active connection and stop its writer task.
+        
+        Note:
+            Used on application shutdown; errors from already closed sockets are ignored
+        """
+        connections = tuple(self.active_connections)
+        for connection in connections:
+            self.disconnect(connection)
+        await asyncio.gather(*[connection.close() for connection in connections], return_exceptions=True)
+
+    def send_nowait(self, websocket: WebSocket, message: str) -> bool:
+        """
+        Queue a message for a single client without waiting for it to be sent.
+        
+        Args:
+            websocket (WebSocket): The connection to send the message to
+            message (str): The message to send
+            
+        Returns:
+            bool: True if the message was queued, False if the client is not connected
+        """
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return False
+        outbox.put({"type": "websocket.send", "text": message})
+        return True
+
+    async def _write(self, websocket: WebSocket, outbox: _Outbox) -> None:
+        """
+        Drain a client's queue, sending each message in order.
+        
+        Args:
+            websocket (WebSocket): The connection to write to
+            outbox (_Outbox): ASGI send events queued for the connection
+            
+        Note:
+            A failed send disconnects the client and ends the writer
+        """
+        try:
+            while True:
+                event = await outbox.get()
+                await websocket.send(event)
+        except WebSocketDisconnect:
+            self.disconnect(websocket)
+        except Exception as e:
+            L.error(f"Error sending message to websocket: {str(e)}")
+            self.disconnect(websocket)
+
+    def has_clients(self) -> bool:
+        """
+        Check whether any WebSocket clients are connected.
+        
+        Returns:
+            bool: True if at least one client is connected
+        """
+        return bool(self._outboxes)
+
+    def broadcast_log_nowait(self, message: str) -> None:
+        """
+        Queue a log message for all connected clients and return immediately.
+        
+        Each client's writer task delivers the message; clients that fail to
+        receive it are removed by their writer.
+        
+        Args:
+            message (str): The message to broadcast to all clients
+            
+        Note:
+            The ASGI send event is built once and shared by every connection.
+            A client whose queue is full loses its oldest queued message.
+        """
+        event = {"type": "websocket.send", "text": message}
+        for outbox in self._outboxes.values():
+            outbox.put(event)
 
     async def broadcast_log(self, message: str) -> None:
         """
         Send a log message to all connected clients.
         
-        This method attempts to send the message to all active connections,
-        handling disconnections and errors gracefully by removing problematic
-        connections from the active list.
+        Awaitable form of broadcast_log_nowait; it does not wait for the
+        message to be delivered.
         
         Args:
             message (str): The message to broadcast to all clients
+        """
+        self.broadcast_log_nowait(message)
+
+    def broadcast_logs_nowait(self, messages: List[str]) -> None:
+        """
+        Queue several log messages for all connected clients in one call.
+        
+        Each message is still sent as its own text frame, so clients see the
+        same wire format as broadcast_log_nowait. The ASGI send events are
+        built once and handed to every client's queue together, waking each
+        writer task once per batch instead of once per message.
+        
+        Args:
+            messages (List[str]): The messages to broadcast, in order
             
         Note:
-            Failed connections are automatically removed from active_connections
-        """
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except WebSocketDisconnect:
-                self.disconnect(connection)
-            except Exception as e:
-                L.error(f"Error sending message to websocket: {str(e)}")
-                self.disconnect(connection)
+            Nothing is built when the list is empty or no clients are connected
+        """
+        if not messages or not self._outboxes:
+            return
+        events = [{"type": "websocket.send", "text": message} for message in messages]
+        for outbox in self._outboxes.values():
+            outbox.put_many(events)
 
 # Create a global connection manager instance
 manager = ConnectionManager()
@@ -1,7 +1,7 @@
-from common.repository import Unity
+from common.repository import get_unity
 
 async def main():
-    unity = Unity()
+    unity = await get_unity()
     result = await unity.run_sql_statement_async("select * from `_data`.`tpch`.`dim_customer` limit 10;")
     print(result)
 
@@ -1,6 +1,103 @@
 import asyncio
 import importlib
 import logging as L
+import os
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Packages scanned for '*_function.py' modules, in increasing order of precedence
+_NAMESPACES = ('functions', 'triggers')
+
+def _scan_function_modules() -> Dict[str, FrozenSet[str]]:
+    """
+    List the function modules available in each package.
+    
+    Both the triggers and functions packages are scanned for '*_function.py'
+    modules, relative to this file rather than the working directory.
+    
+    Returns:
+        Dict[str, FrozenSet[str]]: Package name ('triggers' or 'functions') to the
+                                   function names it implements
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return {
+        namespace: frozenset(
+            entry.name.removesuffix('_function.py')
+            for entry in os.scandir(os.path.join(root, namespace))
+            if entry.is_file() and entry.name.endswith('_function.py')
+        )
+        for namespace in _NAMESPACES
+    }
+
+# Function modules in each package, scanned once at import
+_FUNCTION_MODULES: Dict[str, FrozenSet[str]] = _scan_function_modules()
+
+# Package containing each function module; a function defined in triggers takes precedence
+_FUNCTION_NAMESPACE: Dict[str, str] = {
+    function: namespace
+    for namespace in _NAMESPACES
+    for function in _FUNCTION_MODULES[namespace]
+}
+
+def available_functions(namespace: str = 'functions') -> FrozenSet[str]:
+    """
+    Return the names of the function modules found in a package at startup.
+    
+    Args:
+        namespace (str): Package to list, 'functions' (default) or 'triggers'
+        
+    Returns:
+        FrozenSet[str]: Function names without the '_function.py' suffix
+    """
+    return _FUNCTION_MODULES[namespace]
+
+# Resolved entry points keyed by function name: (main callable, is coroutine function)
+_MAIN_CACHE: Dict[str, Tuple[Callable, bool]] = {}
+
+def _resolve_main(function: str) -> Optional[Tuple[Callable, bool]]:
+    """
+    Import a function module and resolve its main entry point, caching the result.
+    
+    Args:
+        function (str): Name of the function to resolve (without '_function.py' suffix)
+        
+    Returns:
+        Optional[Tuple[Callable, bool]]: The module's main callable and whether it is
+                                         a coroutine function, or None if it has no main
+        
+    Raises:
+        ImportError: If the function module cannot be found
+    """
+    cached = _MAIN_CACHE.get(function)
+    if cached is None:
+        namespace = _FUNCTION_NAMESPACE.get(function)
+        if namespace is None:
+            raise ImportError(f"No module found for function {function}")
+        module = importlib.import_module(f"{namespace}.{function}_function")
+        main = getattr(module, 'main', None)
+        if main is None:
+            return None
+        cached = (main, asyncio.iscoroutinefunction(main))
+        _MAIN_CACHE[function] = cached
+    return cached
+
+async def preload_functions(functions: List[str]) -> None:
+    """
+    Import function modules in the thread pool and cache their entry points.
+    
+    Args:
+        functions (List[str]): Names of the functions to preload
+        
+    Note:
+        Import errors are logged rather than raised; they surface again
+        when the function is executed
+    """
+    results = await asyncio.gather(
+        *[asyncio.to_thread(_resolve_main, function) for function in functions],
+        return_exceptions=True
+    )
+    for function, result in zip(functions, results):
+        if isinstance(result, Exception):
+            L.error(f"Error preloading function {function}: {str(result)}")
 
 # Function to execute actions
 async def execute_action(function: str) -> dict:
@@ -8,10 +105,13 @@ async def execute_action(function: str) -> dict:
     Dynamically imports and executes a function by name.
     
     This function attempts to:
-    1. Import the function module from either triggers or functions directory
+    1. Import the function module from the triggers or functions directory it was found in
     2. Execute the module's main function, handling both sync and async implementations
     3. Return the result or error information
     
+    The resolved main function is cached, so repeated executions skip the
+    import machinery.
+    
     Args:
         function (str): Name of the function to execute (without '_function.py' suffix)
         
@@ -24,20 +124,15 @@ async def execute_action(function: str) -> dict:
     """
     print(f"Executing function: {function}")
     try:
-        # Dynamically import the function module
-        try:
-            # First try to import from triggers folder
-            module = importlib.import_module(f"triggers.{function}_function")
-        except ImportError:
-            # If not found in triggers, try functions folder
-            module = importlib.import_module(f"functions.{function}_function")
-        if hasattr(module, 'main'):
+        entry = _resolve_main(function)
+        if entry is not None:
+            main, is_async = entry
             # Convert the synchronous function to async if needed
-            if asyncio.iscoroutinefunction(module.main):
-                result = await module.main()
+            if is_async:
+                result = await main()
             else:
                 # Run sync functions in a thread pool to avoid blocking
-                result = await asyncio.to_thread(module.main)
+                result = await asyncio.to_thread(main)
             return result
         else:
             L.error(f"No main function found in {function}_function")
@@ -10,14 +10,35 @@ Each handler implements a common interface for setup and execution,
 while providing type-specific functionality.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 import logging as L
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from common.websocket_manager import manager
 from triggers.execute import execute_action
+from triggers.unity_table_listener_function import get_change_event, unity_table_listener
+
+# Default cap on the Unity table check interval, as a multiple of check_interval
+MAX_CHECK_INTERVAL_FACTOR = 8
+
+# Background task running the shared Unity table sweeper, started from the app lifespan
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+class MonitoredTable(NamedTuple):
+    """Sweeper settings for one Unity table, with its log strings formatted once at setup."""
+    function_name: str
+    interval: float
+    max_interval: float
+    monitor_message: str
+    error_context: str
+
+
+# Unity tables checked by the sweeper, keyed by full table name
+_monitored: Dict[str, MonitoredTable] = {}
 
 
 class TriggerHandler(ABC):
@@ -33,10 +54,12 @@ class TriggerHandler(ABC):
         trigger_config (dict): Configuration for the trigger
         app (FastAPI): FastAPI application instance for HTTP endpoints
         scheduler (AsyncIOScheduler): Scheduler for timed tasks
+        router (APIRouter): Router collecting HTTP endpoints for a single include into the app
     """
     
     def __init__(self, function_name: str, trigger_config: Dict[str, Any], 
-                 app: Optional[FastAPI] = None, scheduler: Optional[AsyncIOScheduler] = None):
+                 app: Optional[FastAPI] = None, scheduler: Optional[AsyncIOScheduler] = None,
+                 router: Optional[APIRouter] = None):
         """
         Initialize the trigger handler.
         
@@ -45,33 +68,56 @@ class TriggerHandler(ABC):
             trigger_config (dict): Configuration for the trigger
             app (FastAPI, optional): FastAPI app instance for HTTP endpoints
             scheduler (AsyncIOScheduler, optional): Scheduler for timed tasks
+            router (APIRouter, optional): Router to register HTTP endpoints on instead of the app
         """
         self.function_name = function_name
         self.trigger_config = trigger_config
         self.app = app
         self.scheduler = scheduler
+        self.router = router
         
-    async def log_message(self, message: str) -> None:
+    async def log_message(self, message: str, *args: Any, pending: Optional[List[str]] = None) -> None:
         """
         Log a message and broadcast it via WebSocket.
         
         Args:
-            message (str): Message to log and broadcast
+            message (str): Message to log and broadcast, as a %-style format string
+            *args: Values substituted into the message
+            pending (List[str], optional): If given, the message is appended here
+                                         for a later batched broadcast instead
+                                         
+        Note:
+            Logging is lazy; the message is only formatted for the broadcast
+            when a WebSocket client is connected
         """
-        L.info(message)
-        await manager.broadcast_log(message)
+        L.info(message, *args)
+        if not manager.has_clients():
+            return
+        if args:
+            message = message % args
+        if pending is not None:
+            pending.append(message)
+        else:
+            manager.broadcast_log_nowait(message)
         
-    async def handle_error(self, error: Exception, context: str) -> None:
+    async def handle_error(self, error: Exception, context: str, pending: Optional[List[str]] = None) -> None:
         """
         Handle and log an error, broadcasting it via WebSocket.
         
         Args:
             error (Exception): The error that occurred
             context (str): Context description for the error
+            pending (List[str], optional): If given, the message is appended here
+                                         for a later batched broadcast instead
         """
+        L.error("%s: %s", context, error)
+        if not manager.has_clients():
+            return
         error_msg = f"{context}: {str(error)}"
-        L.error(error_msg)
-        await manager.broadcast_log(error_msg)
+        if pending is not None:
+            pending.append(error_msg)
+        else:
+            manager.broadcast_log_nowait(error_msg)
         
     @abstractmethod
     async def setup(self) -> None:
@@ -96,9 +142,26 @@ class HTTPTriggerHandler(TriggerHandler):
     when HTTP requests are received.
     
     Attributes:
+        endpoint (str): Path of the endpoint to register
+        method (str): HTTP method the endpoint accepts
         Inherits all attributes from TriggerHandler
     """
     
+    def __init__(self, function_name: str, trigger_config: Dict[str, Any], 
+                 app: Optional[FastAPI] = None, scheduler: Optional[AsyncIOScheduler] = None,
+                 router: Optional[APIRouter] = None):
+        """
+        Initialize the handler and validate its trigger configuration.
+        
+        Raises:
+            KeyError: If required trigger configuration is missing
+        """
+        super().__init__(function_name, trigger_config, app, scheduler, router)
+        self.endpoint = trigger_config.get('endpoint')
+        self.method = trigger_config.get('method')
+        if not self.endpoint or not self.method:
+            raise KeyError("HTTP trigger requires 'endpoint' and 'method' configuration")
+    
     async def setup(self) -> None:
         """
         Set up an HTTP endpoint for the function.
@@ -106,33 +169,36 @@ class HTTPTriggerHandler(TriggerHandler):
         Creates a FastAPI route that executes the function when
         an HTTP request is received at the specified endpoint.
         
+        When a router is provided the route is added to it, and the caller
+        includes the router into the app once all handlers are set up, so
+        the app's route table is only extended a single time.
+        
         Raises:
-            ValueError: If FastAPI app instance is not provided
-            KeyError: If required trigger configuration is missing
+            ValueError: If neither a router nor a FastAPI app instance is provided
         """
-        if not self.app:
-            raise ValueError("FastAPI app instance required for HTTP triggers")
+        target = self.router if self.router is not None else self.app
+        if target is None:
+            raise ValueError("FastAPI app instance or APIRouter required for HTTP triggers")
             
-        endpoint = self.trigger_config.get('endpoint')
-        method = self.trigger_config.get('method')
-        if not endpoint or not method:
-            raise KeyError("HTTP trigger requires 'endpoint' and 'method' configuration")
-            
-        await self.log_message(f"Setting up HTTP trigger for function: {self.function_name}")
+        await self.log_message("Setting up HTTP trigger for function: %s", self.function_name)
         
         # Create closure to capture function name
         async def create_endpoint():
+            # Broadcast this invocation's log messages as one batch
+            messages = []
             try:
-                await self.log_message(f"Executing HTTP-triggered function: {self.function_name}")
+                await self.log_message("Executing HTTP-triggered function: %s", self.function_name, pending=messages)
                 await execute_action(self.function_name)
-                await self.log_message(f"Successfully completed function: {self.function_name}")
+                await self.log_message("Successfully completed function: %s", self.function_name, pending=messages)
                 return {"status": "success"}
             except Exception as e:
-                await self.handle_error(e, f"Error executing function {self.function_name}")
+                await self.handle_error(e, f"Error executing function {self.function_name}", pending=messages)
                 return {"status": "error", "message": str(e)}
+            finally:
+                manager.broadcast_logs_nowait(messages)
                 
-        # Register the endpoint with FastAPI
-        self.app.api_route(endpoint, methods=[method])(create_endpoint)
+        # Register the endpoint on the shared router (or directly on the app)
+        target.api_route(self.endpoint, methods=[self.method])(create_endpoint)
         
         
 class TimerTriggerHandler(TriggerHandler):
@@ -143,9 +209,27 @@ class TimerTriggerHandler(TriggerHandler):
     based on cron schedules.
     
     Attributes:
+        schedule (str): Crontab expression from the configuration
+        cron_trigger (CronTrigger): Trigger parsed from the schedule
         Inherits all attributes from TriggerHandler
     """
     
+    def __init__(self, function_name: str, trigger_config: Dict[str, Any], 
+                 app: Optional[FastAPI] = None, scheduler: Optional[AsyncIOScheduler] = None,
+                 router: Optional[APIRouter] = None):
+        """
+        Initialize the handler and validate its trigger configuration.
+        
+        Raises:
+            KeyError: If required trigger configuration is missing
+            ValueError: If the schedule is not a valid crontab expression
+        """
+        super().__init__(function_name, trigger_config, app, scheduler, router)
+        self.schedule = trigger_config.get('schedule')
+        if not self.schedule:
+            raise KeyError("Timer trigger requires 'schedule' configuration")
+        self.cron_trigger = CronTrigger.from_crontab(self.schedule)
+    
     async def setup(self) -> None:
         """
         Set up a scheduled job for the function.
@@ -155,32 +239,33 @@ class TimerTriggerHandler(TriggerHandler):
         
         Raises:
             ValueError: If scheduler instance is not provided
-            KeyError: If required trigger configuration is missing
         """
         if not self.scheduler:
             raise ValueError("Scheduler instance required for timer triggers")
             
-        schedule = self.trigger_config.get('schedule')
-        if not schedule:
-            raise KeyError("Timer trigger requires 'schedule' configuration")
-            
-        await self.log_message(f"Setting up timer trigger for function: {self.function_name}")
-        
-        # Create cron trigger from schedule
-        cron_trigger = CronTrigger.from_crontab(schedule)
+        await self.log_message("Setting up timer trigger for function: %s", self.function_name)
         
-        # Create job function
-        async def run_scheduled_task():
-            try:
-                await self.log_message(f"Executing scheduled function: {self.function_name}")
-                await execute_action(self.function_name)
-                await self.log_message(f"Successfully completed scheduled function: {self.function_name}")
-            except Exception as e:
-                await self.handle_error(e, f"Error in scheduled function {self.function_name}")
-                
         # Add job to scheduler
-        self.scheduler.add_job(run_scheduled_task, cron_trigger)
-        await self.log_message(f"Scheduled function {self.function_name} with cron: {schedule}")
+        self.scheduler.add_job(self._dispatch, self.cron_trigger, args=[self.function_name])
+        await self.log_message("Scheduled function %s with cron: %s", self.function_name, self.schedule)
+        
+    async def _dispatch(self, function_name: str) -> None:
+        """
+        Execute a scheduled function; registered as the scheduler job.
+        
+        Args:
+            function_name (str): Name of the function to execute
+        """
+        # Broadcast this run's log messages as one batch
+        messages = []
+        try:
+            await self.log_message("Executing scheduled function: %s", function_name, pending=messages)
+            await execute_action(function_name)
+            await self.log_message("Successfully completed scheduled function: %s", function_name, pending=messages)
+        except Exception as e:
+            await self.handle_error(e, f"Error in scheduled function {function_name}", pending=messages)
+        finally:
+            manager.broadcast_logs_nowait(messages)
         
         
 class UnityTableTriggerHandler(TriggerHandler):
@@ -190,35 +275,41 @@ class UnityTableTriggerHandler(TriggerHandler):
     This handler sets up monitoring jobs that watch Unity tables
     for changes and execute functions when changes are detected.
     
+    All monitored tables are checked together by one long-running sweeper
+    task that polls adaptively: the wait between sweeps doubles while the
+    tables are idle, up to 'max_check_interval', and returns to
+    'check_interval' once a change is seen. The sweeper can also be woken
+    immediately with notify_table_change.
+    
     Attributes:
+        full_table_name (str): Backtick-escaped catalog.schema.name of the table
+        interval (float): Seconds between checks after a change
+        max_interval (float): Upper bound on the wait while the table is idle
         Inherits all attributes from TriggerHandler
     """
     
-    async def setup(self) -> None:
+    def __init__(self, function_name: str, trigger_config: Dict[str, Any], 
+                 app: Optional[FastAPI] = None, scheduler: Optional[AsyncIOScheduler] = None,
+                 router: Optional[APIRouter] = None):
         """
-        Set up Unity table monitoring for the function.
-        
-        Creates an APScheduler job that periodically checks the specified
-        Unity table for changes and executes the function when changes
-        are detected.
+        Initialize the handler and validate its trigger configuration.
         
         Raises:
-            ValueError: If scheduler instance is not provided
             KeyError: If required trigger configuration is missing
         """
-        if not self.scheduler:
-            raise ValueError("Scheduler instance required for Unity table triggers")
-            
-        table_config = self.trigger_config.get('table_config')
+        super().__init__(function_name, trigger_config, app, scheduler, router)
+        table_config = trigger_config.get('table_config')
         if not table_config:
             raise KeyError("Unity table trigger requires 'table_config' configuration")
             
         # Validate table name structure
-        if not all(key in table_config for key in ['catalog', 'schema', 'name']):
-            raise KeyError("Table name configuration must include 'catalog', 'schema', and 'name'")
+        missing = {'catalog', 'schema', 'name'} - table_config.keys()
+        if missing:
+            raise KeyError(f"Table name configuration missing: {sorted(missing)}")
             
-        # Get check interval (default 60 seconds)
-        interval = self.trigger_config.get('check_interval', 60)
+        # Get check interval (default 60 seconds) and the back-off cap for idle tables
+        self.interval = trigger_config.get('check_interval', 60)
+        self.max_interval = trigger_config.get('max_check_interval', self.interval * MAX_CHECK_INTERVAL_FACTOR)
         
         # Format the full table name with backticks to handle spaces
         def escape_name(name: str) -> str:
@@ -228,36 +319,155 @@ class UnityTableTriggerHandler(TriggerHandler):
         catalog = escape_name(table_config['catalog'])
         schema = escape_name(table_config['schema'])
         name = escape_name(table_config['name'])
-        full_table_name = f"{catalog}.{schema}.{name}"
+        self.full_table_name = f"{catalog}.{schema}.{name}"
+    
+    async def setup(self) -> None:
+        """
+        Set up Unity table monitoring for the function.
         
-        await self.log_message(f"Setting up Unity table trigger for function: {self.function_name}")
+        Registers the table with the shared sweeper, which keeps checking
+        every monitored Unity table for changes and executes the function
+        when changes are detected. The sweeper itself is started once, by
+        start_unity_sweeper, after all triggers have been set up.
+        """
+        full_table_name = self.full_table_name
+        await self.log_message("Setting up Unity table trigger for function: %s", self.function_name)
+        
+        # Register the table with the shared sweeper, which checks all tables together
+        if full_table_name in _monitored:
+            L.warning("Unity table %s is already monitored; now triggering %s", full_table_name, self.function_name)
+        _monitored[full_table_name] = MonitoredTable(
+            function_name=self.function_name,
+            interval=self.interval,
+            max_interval=self.max_interval,
+            monitor_message=f"Monitoring Unity table {full_table_name} for function: {self.function_name}",
+            error_context=f"Error monitoring Unity table {full_table_name}"
+        )
+        await self.log_message("Set up Unity table monitor for %s (checking every %s-%s seconds)",
+                               full_table_name, self.interval, self.max_interval)
+        
+        
+def start_unity_sweeper() -> None:
+    """
+    Start the shared Unity table sweeper as a background task.
+    
+    Note:
+        Called once all triggers are set up. This is a no-op when no Unity
+        tables are monitored or the sweeper is already running.
+    """
+    global _sweeper_task
+    if _monitored and (_sweeper_task is None or _sweeper_task.done()):
+        _sweeper_task = asyncio.create_task(_sweep_all_tables(), name="unity_sweep")
+        
+        
+async def stop_unity_sweeper() -> None:
+    """Cancel the Unity table sweeper, if running, and wait for it to exit."""
+    global _sweeper_task
+    task, _sweeper_task = _sweeper_task, None
+    if task is None:
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
         
-        # Create monitoring function
-        async def monitor_unity_table():
-            try:
-                await self.log_message(f"Monitoring Unity table {full_table_name} for function: {self.function_name}")
-                from triggers.unity_table_listener_function import unity_table_listener
-                await unity_table_listener(full_table_name, self.function_name)
-            except Exception as e:
-                await self.handle_error(e, f"Error monitoring Unity table {full_table_name}")
-                
-        # Add job to scheduler
-        self.scheduler.add_job(monitor_unity_table, 'interval', seconds=interval)
-        await self.log_message(f"Set up Unity table monitor for {full_table_name} (checking every {interval} seconds)")
         
+async def _sweep_all_tables() -> None:
+    """
+    Check every monitored Unity table until cancelled; run as a single background task.
+    
+    Each sweep checks all tables in _monitored concurrently. The wait between
+    sweeps starts at the shortest 'check_interval' of the monitored tables,
+    doubles while no table changes (capped at the shortest 'max_check_interval'),
+    and resets after any change or a notify_table_change call.
+    
+    Note:
+        An unexpected error in a sweep is logged and broadcast, and the next
+        sweep runs as scheduled, so monitoring never stops on its own
+    """
+    change_event = get_change_event()
+    delay = None
+    while True:
+        tables = list(_monitored.items())
+        interval = min(config.interval for _, config in tables)
+        max_interval = min(config.max_interval for _, config in tables)
         
+        try:
+            changed = await _sweep_once(tables)
+        except Exception as e:
+            L.exception("Unity table sweep failed: %s", e)
+            manager.broadcast_log_nowait(f"Unity table sweep failed: {str(e)}")
+            changed = False
+        
+        # Back off while every table is idle, reset once any of them changes
+        delay = interval if changed or delay is None else min(delay * 2, max_interval)
+        try:
+            await asyncio.wait_for(change_event.wait(), timeout=delay)
+            delay = interval
+        except asyncio.TimeoutError:
+            pass
+        change_event.clear()
+        
+        
+async def _sweep_once(tables: List[Tuple[str, MonitoredTable]]) -> bool:
+    """
+    Check the given Unity tables once, concurrently.
+    
+    Args:
+        tables (List[Tuple[str, MonitoredTable]]): Full table names and their sweeper settings
+        
+    Returns:
+        bool: True if a change was detected in any of the tables
+    """
+    messages = [config.monitor_message for _, config in tables]
+    for message in messages:
+        L.info(message)
+    manager.broadcast_logs_nowait(messages)
+    
+    results = await asyncio.gather(
+        *[unity_table_listener(table, config.function_name) for table, config in tables],
+        return_exceptions=True
+    )
+    changed = False
+    errors = []
+    for (_, config), result in zip(tables, results):
+        if isinstance(result, BaseException):
+            L.error("%s: %s", config.error_context, result)
+            errors.append(f"{config.error_context}: {str(result)}")
+        elif result is not None and result.get("changes_detected"):
+            changed = True
+    manager.broadcast_logs_nowait(errors)
+    return changed
+        
+        
+# Handler classes keyed by trigger type
+_HANDLERS: Dict[str, type] = {
+    'http': HTTPTriggerHandler,
+    'timer': TimerTriggerHandler,
+    'unity_table': UnityTableTriggerHandler
+}
+
+
 class TriggerHandlerFactory:
     """
     Factory class for creating appropriate trigger handlers.
     
     This class encapsulates the logic for creating the correct type of
     trigger handler based on the trigger configuration.
+    
+    Note:
+        The setup() of handlers it creates is safe to run concurrently with
+        asyncio.gather: setups share only the event loop thread, and route
+        registration, scheduler.add_job and the Unity table registration (a
+        dict insert; the sweeper is started afterwards) do not await between steps.
     """
     
     @staticmethod
     def create_handler(function_name: str, trigger_config: Dict[str, Any], 
                       app: Optional[FastAPI] = None, 
-                      scheduler: Optional[AsyncIOScheduler] = None) -> TriggerHandler:
+                      scheduler: Optional[AsyncIOScheduler] = None,
+                      router: Optional[APIRouter] = None) -> TriggerHandler:
         """
         Create and return the appropriate trigger handler.
         
@@ -266,25 +476,22 @@ class TriggerHandlerFactory:
             trigger_config (dict): Configuration for the trigger
             app (FastAPI, optional): FastAPI app instance for HTTP endpoints
             scheduler (AsyncIOScheduler, optional): Scheduler for timed tasks
+            router (APIRouter, optional): Router collecting HTTP endpoints
             
         Returns:
             TriggerHandler: The appropriate handler instance for the trigger type
             
         Raises:
             ValueError: If trigger type is not recognized
+            KeyError: If required trigger configuration is missing
         """
         trigger_type = trigger_config.get('type')
         if not trigger_type:
             raise ValueError("Trigger configuration must specify 'type'")
             
-        handlers = {
-            'http': HTTPTriggerHandler,
-            'timer': TimerTriggerHandler,
-            'unity_table': UnityTableTriggerHandler
-        }
-        
-        handler_class = handlers.get(trigger_type)
-        if not handler_class:
-            raise ValueError(f"Unknown trigger type: {trigger_type}")
+        try:
+            handler_class = _HANDLERS[trigger_type]
+        except KeyError:
+            raise ValueError(f"Unknown trigger type: {trigger_type}") from None
             
-        return handler_class(function_name, trigger_config, app, scheduler)
+        return handler_class(function_name, trigger_config, app, scheduler, router)
@@ -1,12 +1,93 @@
 
+import asyncio
 import logging as L
-from common.repository import Unity
+from typing import Dict, Optional
+from common.repository import get_unity
 from triggers.execute import execute_action
 from common.websocket_manager import manager
-# Store the last processed version for each table
-_table_versions = {}
 
-async def unity_table_listener(table_name: str, function_name: str) -> dict:
+
+class _TableState:
+    """Listener state for one table, kept together so a check needs a single dict lookup."""
+    __slots__ = ("version", "lock", "checking")
+
+    def __init__(self) -> None:
+        # Last processed version, None until the initial state is recorded
+        self.version: Optional[int] = None
+        # One check per table at a time, and whether a check is currently running
+        self.lock = asyncio.Lock()
+        self.checking = False
+
+# Listener state for each monitored table
+_tables: Dict[str, _TableState] = {}
+# Event used to wake the table monitor before its next scheduled check
+_change_event = asyncio.Event()
+# Upper bound on change-triggered functions running at once
+MAX_CONCURRENT_ACTIONS = 4
+_action_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ACTIONS)
+# Functions running in the background, referenced so the tasks are not garbage collected
+_action_tasks = set()
+
+def get_change_event() -> asyncio.Event:
+    """
+    Return the event the Unity table monitor waits on between checks.
+    
+    Returns:
+        asyncio.Event: The shared change event
+    """
+    return _change_event
+
+def notify_table_change(table_name: str) -> None:
+    """
+    Wake the monitor so it checks for changes immediately.
+    
+    This is the hook for change notifications from outside the poller,
+    e.g. a function that has just written to the table. All monitored
+    tables are checked on the next sweep.
+    
+    Args:
+        table_name (str): The name of the Unity table that changed
+    """
+    L.info("Change notification received for Unity table %s", table_name)
+    _change_event.set()
+
+async def _run_guarded(function_name: str) -> None:
+    """
+    Execute a change-triggered function in the background.
+    
+    At most MAX_CONCURRENT_ACTIONS functions run at once; the outcome is
+    logged and broadcast via WebSocket when the function finishes.
+    
+    Args:
+        function_name (str): The name of the function to execute
+        
+    Note:
+        execute_action reports failures as an {"error": ...} dict rather
+        than raising, so the result is inspected to tell the two apart
+    """
+    async with _action_semaphore:
+        result = await execute_action(function_name)
+        if isinstance(result, dict) and "error" in result:
+            L.error("Error executing function %s: %s", function_name, result["error"])
+            message = f"Error executing function {function_name}: {result['error']}"
+        else:
+            L.info("Successfully executed function %s", function_name)
+            message = f"Successfully executed function {function_name}"
+        if manager.has_clients():
+            manager.broadcast_log_nowait(message)
+
+async def cancel_pending_actions() -> None:
+    """
+    Cancel change-triggered functions still running in the background.
+    
+    Called on application shutdown; waits for the cancelled tasks to finish.
+    """
+    tasks = list(_action_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def unity_table_listener(table_name: str, function_name: str) -> Optional[dict]:
     """
     Monitor changes in a Unity table and trigger a function when changes are detected.
     
@@ -21,7 +102,8 @@ async def unity_table_listener(table_name: str, function_name: str) -> dict:
         function_name (str): The name of the function to trigger on changes
         
     Returns:
-        dict: Status of the operation with the following structure:
+        Optional[dict]: Status of the operation, or None if no changes were detected.
+            Otherwise it has the following structure:
             On success with changes:
                 {
                     "status": "success",
@@ -29,9 +111,9 @@ async def unity_table_listener(table_name: str, function_name: str) -> dict:
                     "latest_version": <version_number>,
                     "action": "initial state recorded" | "changes processed"
                 }
-            On success without changes:
+            When a check of the same table is already in progress:
                 {
-                    "status": "success",
+                    "status": "skipped",
                     "changes_detected": False
                 }
             On error:
@@ -42,33 +124,58 @@ async def unity_table_listener(table_name: str, function_name: str) -> dict:
                 
     Note:
         - The first run for a table will record the initial state without triggering the function
-        - Subsequent changes will trigger the specified function
-        - Version tracking persists across function calls using the _table_versions global dict
+        - Subsequent changes will trigger the specified function in a background task,
+          so the check returns without waiting for the function to finish
+        - Version tracking persists across function calls in the per-table state of the _tables global dict
+        - Status messages are broadcast via WebSocket as a single batch once the check completes
+        - Overlapping checks of the same table are skipped, so a slow check can never
+          execute the function twice for one change
     """
-    try:
+    state = _tables.get(table_name)
+    if state is None:
+        state = _tables[table_name] = _TableState()
+    if state.checking:
+        L.info("Skipping check of Unity table %s: previous check still in progress", table_name)
+        return {"status": "skipped", "changes_detected": False}
+    async with state.lock:
+        state.checking = True
         try:
-            await manager.broadcast_log(f"Checking Unity table {table_name} for changes...")
-        except Exception as ws_exc:
-            L.warning(f"WebSocket broadcast failed: {ws_exc}")
-        # Get Unity connection
-        unity = Unity()
-        # Get the last processed version for this table
-        last_version = _table_versions.get(table_name)
-        # Check for changes
-        changes = await unity.detect_changes(table_name, last_version)
+            return await _check_table(table_name, function_name, state)
+        finally:
+            state.checking = False
+
+async def _check_table(table_name: str, function_name: str, state: _TableState) -> Optional[dict]:
+    """
+    Run a single change check for a table; see unity_table_listener for details.
+    
+    Args:
+        table_name (str): The name of the Unity table to check
+        function_name (str): The name of the function to trigger on changes
+        state (_TableState): Listener state of the table, updated in place
+        
+    Returns:
+        Optional[dict]: Status of the check, as returned by unity_table_listener
+    """
+    # Log messages for this check, broadcast together as one batch at the end
+    messages = [f"Checking Unity table {table_name} for changes..."]
+    try:
+        # Get the shared Unity instance
+        unity = await get_unity()
+        # Check for changes since the last processed version
+        changes = await unity.detect_changes(table_name, state.version)
         if changes:
-            change_msg = f"Detected changes in Unity table {table_name} - new version: {changes['latest_version']}"
-            L.info(change_msg)
-            await manager.broadcast_log(change_msg)
+            L.info("Detected changes in Unity table %s - new version: %s", table_name, changes["latest_version"])
+            messages.append(f"Detected changes in Unity table {table_name} - new version: {changes['latest_version']}")
             # Update the last processed version
-            _table_versions[table_name] = changes["latest_version"]
+            state.version = changes["latest_version"]
             # If this is not just the initial state, trigger the example function
             if changes["type"] != "initial_state":
-                await manager.broadcast_log(f"Triggering function {function_name} due to table changes")
-                await execute_action(function_name)
-                await manager.broadcast_log(f"Successfully executed function {function_name}")
+                messages.append(f"Triggering function {function_name} due to table changes")
+                task = asyncio.create_task(_run_guarded(function_name))
+                _action_tasks.add(task)
+                task.add_done_callback(_action_tasks.discard)
             else:
-                await manager.broadcast_log(f"Recorded initial state for table {table_name}")
+                messages.append(f"Recorded initial state for table {table_name}")
             return {
                 "status": "success",
                 "changes_detected": True,
@@ -76,13 +183,12 @@ async def unity_table_listener(table_name: str, function_name: str) -> dict:
                 "action": "initial state recorded" if changes["type"] == "initial_state" else "changes processed"
             }
         
-        return {
-            "status": "success",
-            "changes_detected": False
-        }
+        # Nothing changed: the hot path returns without building a status dict
+        return None
         
     except Exception as e:
-        error_msg = f"Error monitoring Unity table {table_name}: {str(e)}"
-        L.error(error_msg)
-        await manager.broadcast_log(error_msg)
+        L.error("Error monitoring Unity table %s: %s", table_name, e)
+        messages.append(f"Error monitoring Unity table {table_name}: {str(e)}")
         return {"status": "error", "message": str(e)}
+    finally:
+        manager.broadcast_logs_nowait(messages)